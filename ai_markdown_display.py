@@ -3,66 +3,17 @@
 AI Markdown Display - PyQt5 window to display AI responses with proper markdown formatting
 """
 import sys
-import re
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QScrollArea, 
-                            QWidget, QTextEdit, QLabel, QSizePolicy, QFrame)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+import hashlib
+from collections import OrderedDict
+from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QTextBrowser
+from PyQt5.QtGui import QColor, QFont, QTextBlockFormat, QTextCursor, QTextDocument, QTextFormat
 
-class CodeBlock(QTextEdit):
-    """Widget for displaying code blocks with proper formatting"""
-    def __init__(self, text, parent=None):
-        super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Courier New", 10))
-        self.setStyleSheet("""
-            QTextEdit {
-                background-color: #f5f5f5;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 10px;
-                margin: 10px 0;
-            }
-        """)
-        self.setText(text)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Set fixed height based on content with some padding
-        doc_height = self.document().size().height()
-        self.setMinimumHeight(min(int(doc_height + 30), 300))
-        
-        # Disable text wrapping for code blocks to preserve formatting
-        self.setLineWrapMode(QTextEdit.NoWrap)
+# Parsed documents by response hash, so reopening a response skips the parse
+DOCUMENT_CACHE_SIZE = 16
+_document_cache = OrderedDict()
 
-class TextBlock(QTextEdit):
-    """Widget for displaying regular text with proper formatting"""
-    def __init__(self, text, parent=None):
-        super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Arial", 11))
-        self.setStyleSheet("""
-            QTextEdit {
-                border: none;
-                background-color: transparent;
-                line-height: 1.4;
-                margin: 5px 0;
-            }
-        """)
-        self.setText(text)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
-        
-        # Enable text wrapping for regular text
-        self.setLineWrapMode(QTextEdit.WidgetWidth)
-        
-        # Set fixed height based on content
-        doc_height = self.document().size().height()
-        self.setMinimumHeight(int(doc_height + 20))
-        
-        # Set document margins
-        document = self.document()
-        document.setDocumentMargin(10)
+# Background of fenced code blocks (setMarkdown ignores the default stylesheet)
+CODE_BACKGROUND = QColor("#f5f5f5")
 
 class AIMarkdownViewer(QMainWindow):
     """Main window for displaying AI responses with markdown formatting"""
@@ -83,56 +34,44 @@ class AIMarkdownViewer(QMainWindow):
         self.main_layout.setContentsMargins(20, 20, 20, 20)
         self.main_layout.setSpacing(0)
         
-        # Scroll area for content
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Content widget and layout
-        self.content_widget = QWidget()
-        self.content_layout = QVBoxLayout(self.content_widget)
-        self.content_layout.setContentsMargins(10, 10, 10, 10)
-        self.content_layout.setSpacing(15)  # Space between blocks
+        # Single read-only browser for the whole response (scrolls by itself)
+        self.browser = QTextBrowser()
+        self.browser.setOpenExternalLinks(True)
+        self.browser.setFont(QFont("Arial", 11))
+        self.browser.document().setDocumentMargin(10)
         
-        # Set content widget in scroll area
-        self.scroll_area.setWidget(self.content_widget)
-        
-        # Add scroll area to main layout
-        self.main_layout.addWidget(self.scroll_area)
+        # Add browser to main layout
+        self.main_layout.addWidget(self.browser)
         
         # Set main widget
         self.setCentralWidget(self.main_widget)
     
     def render_markdown(self, markdown_text):
         """Parse and render markdown content"""
-        # Split the markdown by code blocks
-        parts = re.split(r'(```[\s\S]*?```)', markdown_text)
+        key = hashlib.sha1(markdown_text.encode()).hexdigest()
+        cached = _document_cache.get(key)
+        if cached is not None:
+            # Same response shown before - reuse a copy of its document
+            _document_cache.move_to_end(key)
+            self.browser.setDocument(cached.clone(self.browser))
+            return
+        
+        # Qt parses fenced code (in a fixed-pitch font), tables and headers natively
+        document = self.browser.document()
+        document.setMarkdown(markdown_text, QTextDocument.MarkdownDialectGitHub)
         
-        for part in parts:
-            if part.strip():
-                if part.startswith('```') and part.endswith('```'):
-                    # Code block
-                    # Remove the code fence markers and language identifier if present
-                    code_content = re.sub(r'^```\w*\n', '', part)
-                    code_content = re.sub(r'```$', '', code_content)
-                    
-                    # Add vertical padding before code block
-                    self.content_layout.addSpacing(10)
-                    
-                    # Add code block
-                    code_block = CodeBlock(code_content)
-                    self.content_layout.addWidget(code_block)
-                    
-                    # Add vertical padding after code block
-                    self.content_layout.addSpacing(10)
-                else:
-                    # Regular text
-                    text_block = TextBlock(part)
-                    self.content_layout.addWidget(text_block)
+        # Shade the code fences the way the old per-block widgets did
+        code_format = QTextBlockFormat()
+        code_format.setBackground(CODE_BACKGROUND)
+        block = document.begin()
+        while block.isValid():
+            if block.blockFormat().hasProperty(QTextFormat.BlockCodeFence):
+                QTextCursor(block).mergeBlockFormat(code_format)
+            block = block.next()
         
-        # Add stretch to push content to the top
-        self.content_layout.addStretch()
+        _document_cache[key] = document.clone()
+        if len(_document_cache) > DOCUMENT_CACHE_SIZE:
+            _document_cache.popitem(last=False)
 
 def display_ai_response(response_text, title="AI Response"):
     """Display AI response with proper markdown formatting"""
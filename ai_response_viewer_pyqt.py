@@ -3,20 +3,26 @@
 AI Response Viewer - PyQt5 application to display AI responses with proper markdown rendering
 """
 import sys
-import requests
 import json
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                             QWidget, QLineEdit, QPushButton, QLabel, QMessageBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QUrl
 from PyQt5.QtGui import QFont
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 
 # Import our markdown viewer
 from markdown_viewer_pyqt import show_markdown
 
+API_URL = 'http://localhost:9090/api/ask_ai'
+REQUEST_TIMEOUT_MS = 30000
+
 class AIResponseViewer(QMainWindow):
     """Main window for the AI Response Viewer application"""
     def __init__(self):
         super().__init__()
+        # Requests run on Qt's event loop, so the window stays responsive
+        self.net = QNetworkAccessManager(self)
+        self.reply = None
         self.init_ui()
     
     def init_ui(self):
@@ -64,45 +70,56 @@ class AIResponseViewer(QMainWindow):
         self.setCentralWidget(main_widget)
     
     def send_request(self):
-        """Send the question to the API and display the response"""
+        """Send the question to the API without blocking the GUI thread"""
         question = self.input_field.text().strip()
         
         if not question:
             QMessageBox.warning(self, "Empty Question", "Please enter a question.")
             return
         
+        # Ignore repeated submits while a request is in flight
+        if self.reply is not None:
+            return
+        
+        request = QNetworkRequest(QUrl(API_URL))
+        request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
+        request.setTransferTimeout(REQUEST_TIMEOUT_MS)
+        
+        self.reply = self.net.post(request, json.dumps({"question": question}).encode())
+        self.reply.finished.connect(self._on_reply)
+        
+        # Busy indicator while waiting for the response
+        self.submit_button.setEnabled(False)
+        QApplication.setOverrideCursor(Qt.BusyCursor)
+    
+    def _on_reply(self):
+        """Display the API response once the request has finished"""
+        reply, self.reply = self.reply, None
+        QApplication.restoreOverrideCursor()
+        self.submit_button.setEnabled(True)
+        
         try:
-            # Disable input while waiting for response
-            self.input_field.setEnabled(False)
-            self.submit_button.setEnabled(False)
-            self.submit_button.setText("Loading...")
-            
-            # Send request to API
-            response = requests.post(
-                'http://localhost:9090/api/ask_ai',
-                json={"question": question},
-                timeout=30
-            )
+            body = bytes(reply.readAll()).decode('utf-8', errors='replace')
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
             
             # Process response
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
+                data = json.loads(body)
                 markdown_response = data.get('response', 'No response received')
                 
                 # Show the response in the markdown viewer
                 show_markdown(markdown_response)
-            else:
-                error_message = f"Error: {response.status_code}\n{response.text}"
+            elif status is not None:
+                error_message = f"Error: {status}\n{body}"
                 QMessageBox.critical(self, "API Error", error_message)
+            elif reply.error() != QNetworkReply.NoError:
+                QMessageBox.critical(self, "Error", f"An error occurred: {reply.errorString()}")
         
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
         
         finally:
-            # Re-enable input
-            self.input_field.setEnabled(True)
-            self.submit_button.setEnabled(True)
-            self.submit_button.setText("Ask AI")
+            reply.deleteLater()
             self.input_field.selectAll()
             self.input_field.setFocus()
 
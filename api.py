@@ -6,11 +6,63 @@ from dotenv import load_dotenv
 from flask import Flask, request, jsonify
 import os
 import json
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Shared HTTP session so connections to OpenRouter are kept alive and reused
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+# Fixed parts of every OpenRouter request, built once
+SYSTEM_PROMPT = (
+    "You are an AI tutor for Data Structures and Algorithms. The Answer should be in a simple text format without any images. "
+    "If the user asks something unrelated, reply exactly with: "
+    "'This bot only answers questions related to Data Structures and Computer Science.' "
+    "No markdown, no tables, no bold/italic, no emojis, no symbols like | or ##. "
+    "Just plain text paragraphs with short line breaks."
+)
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "Referer": "http://localhost:5090",
+    "X-Title": "Visualizer App"
+}
+
+# Repeated questions are answered from this cache without calling OpenRouter.
+# Failed requests raise, so errors are never cached.
+@lru_cache(maxsize=512)
+def ask_openrouter(question, api_key):
+    """Ask OpenRouter a question and return the raw reply"""
+    headers = {"Authorization": f"Bearer {api_key}", **BASE_HEADERS}
+
+    payload = {
+        "model": "openai/gpt-oss-20b:free",
+        "messages": [SYSTEM_MESSAGE, {"role": "user", "content": question}],
+        "max_tokens": 250,
+        "temperature": 0.5
+    }
+
+    response = session.post(
+        "https://openrouter.ai/api/v1/chat/completions",
+        headers=headers,
+        data=json.dumps(payload),
+        timeout=30  # bound how long a worker thread waits on OpenRouter
+    )
+    response.raise_for_status()
+
+    data = response.json()
+    # Returned as-is; the markdown viewers render it on the client
+    return data["choices"][0]["message"]["content"]
+
 # Initialize Flask app
 app = Flask(__name__)
 
@@ -36,56 +88,16 @@ def ask_ai():
                 "error": "Missing API key"
             }), 500
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-            "Referer": "http://localhost:5090",
-            "X-Title": "Visualizer App"
-        }
-
-        payload = {
-            "model": "openai/gpt-oss-20b:free",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an AI tutor for Data Structures and Algorithms. The Answer should be in a simple text format without any images"
-                        "If the user asks something unrelated, reply exactly with: "
-                        "'This bot only answers questions related to Data Structures and Computer Science.' "
-                        "No markdown, no tables, no bold/italic, no emojis, no symbols like | or ##. "
-                        "Just plain text paragraphs with short line breaks."
-                    )
-                },
-                {"role": "user", "content": question}
-            ],
-            "max_tokens": 250,
-            "temperature": 0.5
-        }
-
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            data=json.dumps(payload)
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            reply = data["choices"][0]["message"]["content"]
-            import re
-            reply = re.sub(r"[*_#>`|~]+", "", reply)         # kill markdown symbols
-            reply = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", reply)  # remove markdown links
-            reply = re.sub(r"(?m)^\s*[-*]\s+", "", reply)    # remove bullet points
-            reply = re.sub(r"(?m)^\s*\d+\.\s+", "", reply)   # remove numbered lists
-            reply = re.sub(r"```.*?```", "", reply, flags=re.S)  # remove code blocks
-            reply = re.sub(r"\n{2,}", "\n\n", reply)         # normalize newlines
-            reply = re.sub(r"\s{2,}", " ", reply)            # collapse extra spaces
-            reply = "\n".join(line.strip() for line in reply.splitlines() if line.strip())
-            # send clean reply back to frontend
-            return jsonify({"response": reply})
-        else:
+        try:
+            reply = ask_openrouter(question, api_key)
+        except requests.HTTPError as http_error:
+            response = http_error.response
             print(f"AI request error: {response.status_code} - {response.text}")
             return jsonify({"error": response.text}), response.status_code
 
+        # send the reply back to the frontend as the model wrote it
+        return jsonify({"response": reply})
+
     except Exception as e:
         error_type = type(e).__name__
         error_message = str(e)
@@ -114,4 +126,5 @@ def ask_ai():
 
 if __name__ == '__main__':
     port = int(os.getenv('API_PORT', 5090))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # Serve each request on its own thread so slow AI calls don't queue
+    app.run(host='0.0.0.0', port=port, debug=True, threaded=True)
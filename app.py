@@ -4,28 +4,28 @@ Flask web application for the Data Structure Visualizer
 """
 import os
 import sys
-import json
+import atexit
+import logging
+import logging.handlers
 import subprocess
+import queue
 import random
 import threading
+import importlib.util
 from datetime import datetime
+from functools import cache
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, jsonify, send_file
-from openai import OpenAI
-from PyQt5.QtWidgets import QApplication
-
-# Import our markdown display module
-from ai_markdown_display import display_ai_response
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 
 # Function to check and create .env file if it doesn't exist
 def ensure_env_file_exists():
     """Check if .env file exists, if not create it and prompt for API key"""
-    env_path = Path('.env')
-    env_exists = env_path.exists()
-    
-    if not env_exists:
+    # A single stat; the startup banner reuses the result instead of checking again
+    if not os.path.exists('.env'):
         print("\n⚠️ No .env file found. Creating one now...")
         api_key = input("\n🔑 Please enter your OpenRouter API key (starts with 'sk-'): ")
         
@@ -47,7 +47,8 @@ env_created = ensure_env_file_exists()
 # Load environment variables from .env file
 load_dotenv()
 
-# Verify API key exists and is valid
+# Verify API key exists and is valid (the environment is read once per process)
+@cache
 def verify_api_key():
     """Verify that a valid API key exists"""
     # Check for OpenRouter API key first, then fall back to OpenAI API key
@@ -67,60 +68,167 @@ def verify_api_key():
     print(f"✅ API key loaded: {masked_key}")
     return True, api_key
 
-# Initialize OpenAI client only if API key is valid
 key_valid, api_key = verify_api_key()
+
+# Masked key for request logs, built once
+MASKED_KEY = f"{api_key[:7]}{'*' * (len(api_key) - 7)}" if api_key else "None"
+
+# OpenAI client, created on the first AI request (only if the API key is valid);
+# the lock keeps concurrent first requests from each building a client
 client = None
-if key_valid:
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
+client_lock = threading.Lock()
+
+def get_client():
+    """Return the shared OpenAI client, importing the SDK on first use"""
+    global client
+    if client is None and key_valid:
+        with client_lock:
+            if client is None:
+                import httpx
+                from openai import OpenAI
+                # One pooled HTTP client for all AI requests, so keep-alive TLS
+                # connections to OpenRouter are reused between questions
+                client = OpenAI(
+                    base_url="https://openrouter.ai/api/v1",
+                    api_key=api_key,
+                    timeout=30,
+                    default_headers=AI_EXTRA_HEADERS,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60)
+                    ),
+                )
+    return client
 
 # Print startup verification
 print("\n=== Flask App Startup Verification ===")
-print(f".env file found: {'✅' if os.path.exists('.env') else '❌'}")
+print(f".env file {'created' if env_created else 'found'}: ✅")
 print(f"API key loaded: {'✅' if api_key else '❌'}")
 print(f"Key starts with sk-: {'✅' if api_key and api_key.startswith('sk-') else '❌'}")
 
+# Request-time log lines are queued and written by a background listener thread,
+# so request threads never wait on the stdout lock
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger('visualzzer')
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.propagate = False
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by jsonify and request.get_json;
+    whatever orjson cannot encode (e.g. integers wider than 64 bits) goes
+    through the stdlib encoder as before"""
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, default=self.default).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # orjson already produces bytes, so send them without a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=self.default)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'default-secret-key')
-app.config['DEBUG'] = True
+
+# Get port from environment variables with fallback
+port = int(os.getenv('PORT', 9090))
+
+# Fixed parts of every AI request, built once
+AI_MODEL = "openai/gpt-oss-20b:free"
+SYSTEM_PROMPT = "You are a helpful assistant that explains data structures and algorithms simply and visually."
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+AI_EXTRA_HEADERS = {
+    "HTTP-Referer": f"http://localhost:{port}",  # your site url
+    "X-Title": "Data Structure Visualizer",  # app name
+}
+
+# Command for the pygame visualizer: this interpreter and an absolute script path,
+# resolved once instead of looking up 'python' on PATH for every launch
+VISUALIZER_CMD = [sys.executable, str(Path(__file__).resolve().with_name('visualiser.py')), '-']
+
+# Dedicated generator and value pool for random number lists
+RNG = random.Random()
+RANDOM_POOL = range(5, 101)
+
+# Values the visualizer accepts (the range the pages document) and how many
+# of them it draws, the same cap as its own input dialog
+MAX_NUMBER = 1000
+MAX_VISUALIZER_COUNT = 25
 
 def gen_random_list(n):
     """Generate random list of numbers"""
-    return [random.randint(5, 100) for _ in range(n)]
+    # choices draws all n values in a single call
+    return RNG.choices(RANDOM_POOL, k=n)
+
+def summarize(numbers):
+    """Build the numbers/count/min/max payload shared by the number endpoints"""
+    # One pass for both bounds instead of separate min() and max() scans
+    low = high = numbers[0]
+    for num in numbers:
+        if num < low:
+            low = num
+        elif num > high:
+            high = num
+    return {
+        'numbers': numbers,
+        'count': len(numbers),
+        'min': low,
+        'max': high
+    }
+
+@cache
+def render_cached(name):
+    """Render a template that has no per-request context, once per process"""
+    return render_template(name)
+
+def render_page(name):
+    """Render a static page, from the cache unless templates may be changing"""
+    return render_template(name) if app.debug else render_cached(name)
 
 @app.route('/')
 def index():
     """Landing page"""
-    return render_template('index.html')
+    return render_page('index.html')
 
 @app.route('/home')
 def home():
     """Home page"""
-    return render_template('index.html')
+    return render_page('index.html')
 
 @app.route('/how-to')
 def how_to():
     """How-to page with instructions"""
-    return render_template('how_to.html')
+    return render_page('how_to.html')
 
 @app.route('/algorithms')
 def algorithms():
     """Algorithms page"""
-    return render_template('algorithms.html')
+    return render_page('algorithms.html')
 
 @app.route('/visualizer')
 def visualizer():
     """Visualizer page"""
-    return render_template('visualizer.html')
+    return render_page('visualizer.html')
 
 @app.route('/ai_mode')
 def ai_mode():
     """AI Mode page"""
-    return render_template('ai_mode.html')
+    return render_page('ai_mode.html')
 
 @app.route('/api/random-numbers')
 def api_random_numbers():
@@ -129,29 +237,20 @@ def api_random_numbers():
     if count > 50:
         count = 50
     numbers = gen_random_list(count)
-    return jsonify({
-        'numbers': numbers,
-        'count': len(numbers),
-        'min': min(numbers),
-        'max': max(numbers)
-    })
+    return jsonify(summarize(numbers))
+
+@cache
+def module_available(name):
+    """Check once per process whether a module can be imported"""
+    return importlib.util.find_spec(name) is not None
 
 @app.route('/api/check-dependencies')
 def check_dependencies():
     """Check if required dependencies are installed"""
     try:
-        # Check for PyQt5
-        import importlib.util
-        pyqt_spec = importlib.util.find_spec("PyQt5")
-        pyqt_available = pyqt_spec is not None
-        
-        # Check for pygame
-        pygame_spec = importlib.util.find_spec("pygame")
-        pygame_available = pygame_spec is not None
-        
         return jsonify({
-            "pyqt_available": pyqt_available,
-            "pygame_available": pygame_available,
+            "pyqt_available": module_available("PyQt5"),
+            "pygame_available": module_available("pygame"),
             "status": "ok"
         })
     except Exception as e:
@@ -172,9 +271,16 @@ def validate_numbers():
         # Split by any whitespace (spaces, tabs, newlines)
         number_strings = input_text.split()
         
-        # Try to convert each string to an integer
+        # Reject oversized input before converting any of it
+        if len(number_strings) > 100:
+            return jsonify({
+                "valid": False,
+                "error": "Too many numbers. Please enter at most 100 numbers."
+            })
+        
+        # Convert all strings to integers in one C-level pass
         try:
-            numbers = [int(num) for num in number_strings]
+            numbers = list(map(int, number_strings))
         except ValueError:
             return jsonify({
                 "valid": False,
@@ -187,22 +293,9 @@ def validate_numbers():
                 "valid": False,
                 "error": "Please enter at least 2 numbers."
             })
-            
-        # Check if we have too many numbers
-        if len(numbers) > 100:
-            return jsonify({
-                "valid": False,
-                "error": "Too many numbers. Please enter at most 100 numbers."
-            })
         
         # Success case
-        return jsonify({
-            "valid": True,
-            "numbers": numbers,
-            "count": len(numbers),
-            "min": min(numbers),
-            "max": max(numbers)
-        })
+        return jsonify({"valid": True, **summarize(numbers)})
         
     except Exception as e:
         return jsonify({
@@ -230,29 +323,92 @@ def run_visualizer():
             else:
                 numbers = gen_random_list(25)
         
-        # Save numbers to a temporary file
-        import tempfile
-        import subprocess
+        # Reject anything the visualizer cannot show before a process is started
+        if not 1 <= len(numbers) <= MAX_VISUALIZER_COUNT:
+            return jsonify({"success": False, "error": f"Please send between 1 and {MAX_VISUALIZER_COUNT} numbers."})
+        if not all(type(num) is int and 1 <= num <= MAX_NUMBER for num in numbers):
+            return jsonify({"success": False, "error": f"Numbers must be integers between 1 and {MAX_NUMBER}."})
         
-        temp_file = tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.json')
-        json.dump({"numbers": numbers}, temp_file)
-        temp_file.close()
+        # Encode first, so a failure cannot leave a visualizer waiting on stdin
+        payload = orjson.dumps({"numbers": numbers})
         
         # Launch the visualizer in a separate process - use visualiser.py (Pygame) instead of visualiser_pyqt5.py
-        subprocess.Popen(['python', 'visualiser.py', temp_file.name])
+        # The numbers are handed over on its stdin ('-'), no temporary file needed
+        process = subprocess.Popen(VISUALIZER_CMD, stdin=subprocess.PIPE)
+        process.stdin.write(payload)
+        process.stdin.close()
         
         return jsonify({"success": True, "message": "Visualizer launched successfully"})
     except Exception as e:
-        print(f"Error launching visualizer: {str(e)}")
+        logger.error(f"Error launching visualizer: {str(e)}")
         return jsonify({"success": False, "error": str(e)})
 
+# AI responses waiting to be shown in a PyQt window, consumed by one Qt thread
+qt_jobs = queue.Queue()
+qt_thread = None
+qt_thread_lock = threading.Lock()
+
+def qt_worker():
+    """Own the single QApplication and open a viewer for each queued response"""
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from ai_markdown_display import AIMarkdownViewer
+    
+    qt_app = QApplication(sys.argv)
+    qt_app.setQuitOnLastWindowClosed(False)
+    windows = []
+    
+    def show_pending():
+        # Drop closed windows, then open any responses that arrived
+        windows[:] = [window for window in windows if window.isVisible()]
+        while True:
+            try:
+                answer, title = qt_jobs.get_nowait()
+            except queue.Empty:
+                return
+            viewer = AIMarkdownViewer(answer, title)
+            viewer.show()
+            windows.append(viewer)
+    
+    timer = QTimer()
+    timer.timeout.connect(show_pending)
+    timer.start(100)
+    qt_app.exec_()
+
+def show_in_pyqt(answer, title):
+    """Queue a response for the Qt thread, starting it on first use"""
+    global qt_thread
+    with qt_thread_lock:
+        if qt_thread is None:
+            qt_thread = threading.Thread(target=qt_worker, daemon=True)
+            qt_thread.start()
+    qt_jobs.put((answer, title))
+
+def stream_answer(client, question):
+    """Yield the AI answer as Server-Sent Events, one event per token chunk"""
+    try:
+        completion = client.chat.completions.create(
+            model=AI_MODEL,
+            messages=[SYSTEM_MESSAGE, {"role": "user", "content": question}],
+            stream=True
+        )
+        for chunk in completion:
+            token = chunk.choices[0].delta.content if chunk.choices else None
+            if token:
+                yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+    except Exception as api_error:
+        logger.error(f"❌ OpenRouter API error: {str(api_error)}")
+        yield f"data: {orjson.dumps({'error': 'AI unavailable. Please check your key or network.'}).decode()}\n\n"
+    yield "data: [DONE]\n\n"
+
 @app.route('/api/ask_ai', methods=['POST'])
 def ask_ai():
     """API endpoint to ask AI a question about data structures and algorithms"""
     try:
         # Check if client is properly initialized
+        client = get_client()
         if client is None:
-            print("❌ AI request failed: OpenAI client not initialized")
+            logger.error("❌ AI request failed: OpenAI client not initialized")
             return jsonify({"response": "AI unavailable. Please check your API key or network."}), 503
         
         data = request.get_json()
@@ -262,52 +418,47 @@ def ask_ai():
         if not question:
             return jsonify({"response": "Please provide a question."}), 400
         
-        # Mask API key in logs
-        masked_key = f"{api_key[:7]}{'*' * (len(api_key) - 7)}" if api_key else "None"
-        print(f"Making AI request with key: {masked_key}")
+        logger.info(f"Making AI request with key: {MASKED_KEY}")
+        
+        # Stream the answer token by token when the client asks for it
+        if data.get("stream", False):
+            return Response(stream_with_context(stream_answer(client, question)),
+                            mimetype='text/event-stream')
         
         # Make the API request with proper error handling
         try:
             completion = client.chat.completions.create(
-                model="openai/gpt-oss-20b:free",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that explains data structures and algorithms simply and visually."},
-                    {"role": "user", "content": question}
-                ],
-                extra_headers={
-                    "HTTP-Referer": f"http://localhost:{port}",  # your site url
-                    "X-Title": "Data Structure Visualizer",  # app name
-                }
+                model=AI_MODEL,
+                messages=[SYSTEM_MESSAGE, {"role": "user", "content": question}]
             )
             
             answer = completion.choices[0].message.content
             
             # If display_in_pyqt flag is set, show the response in a PyQt window
             if display_in_pyqt:
-                # Launch in a separate thread to avoid blocking the Flask server
-                threading.Thread(target=lambda: display_ai_response(answer, f"AI Response: {question[:30]}...")).start()
+                # Handed to the long-lived Qt thread so the Flask server never blocks
+                show_in_pyqt(answer, f"AI Response: {question[:30]}...")
             
             return jsonify({"response": answer})
             
         except Exception as api_error:
-            print(f"❌ OpenRouter API error: {str(api_error)}")
+            logger.error(f"❌ OpenRouter API error: {str(api_error)}")
             # Keep the app running but return a friendly error message
             return jsonify({"response": "AI unavailable. Please check your key or network."}), 503
 
     except Exception as e:
-        print(f"❌ General error in ask_ai endpoint: {str(e)}")
+        logger.error(f"❌ General error in ask_ai endpoint: {str(e)}")
         return jsonify({"response": "Something went wrong. Please try again later."}), 500
 
 
 
 if __name__ == '__main__':
-    # Get port from environment variables with fallback
-    port = int(os.getenv('PORT', 9090))
-    
     # Print final verification message
     print(f"Flask app running at port: ✅ {port}")
     print("=== Server Starting ===\n")
     
-    # Run the Flask app
-    app.run(host='0.0.0.0', port=port)
+    # Serve with waitress: a fixed pool of worker threads handles concurrent
+    # AI calls and visualizer launches without the dev server's overhead
+    from waitress import serve
+    serve(app, host='0.0.0.0', port=port, threads=16, connection_limit=512)
 
@@ -7,7 +7,7 @@ This shows how the input mechanism works before pygame is available.
 import random
 
 def gen_random_list(n):
-    return [random.randint(5, 100) for _ in range(n)]
+    return random.choices(range(5, 101), k=n)
 
 def get_user_input():
     """Get user input for custom numbers"""
@@ -37,26 +37,31 @@ def get_user_input():
                 print("Please enter at least one number.")
                 continue
             
-            # Convert to integers
-            numbers = []
-            for num_str in numbers_str:
-                try:
-                    num = int(num_str)
-                    if num < 1 or num > 1000:
-                        print(f"Number {num} is out of range (1-1000). Please try again.")
+            # Convert to integers in one C-level pass
+            try:
+                numbers = list(map(int, numbers_str))
+            except ValueError:
+                # Slow path only to name the offending token
+                for num_str in numbers_str:
+                    try:
+                        int(num_str)
+                    except ValueError:
+                        print(f"'{num_str}' is not a valid number. Please try again.")
                         break
-                    numbers.append(num)
-                except ValueError:
-                    print(f"'{num_str}' is not a valid number. Please try again.")
-                    break
-            else:
-                # All numbers were valid
-                if len(numbers) > 25:
-                    print(f"Too many numbers ({len(numbers)}). Using first 25 numbers.")
-                    numbers = numbers[:25]
-                
-                print(f"Using {len(numbers)} numbers: {numbers}")
-                return numbers
+                continue
+            
+            out_of_range = next((num for num in numbers if num < 1 or num > 1000), None)
+            if out_of_range is not None:
+                print(f"Number {out_of_range} is out of range (1-1000). Please try again.")
+                continue
+            
+            # All numbers were valid
+            if len(numbers) > 25:
+                print(f"Too many numbers ({len(numbers)}). Using first 25 numbers.")
+                numbers = numbers[:25]
+            
+            print(f"Using {len(numbers)} numbers: {numbers}")
+            return numbers
                 
         except Exception as e:
             print(f"Error parsing input: {e}. Please try again.")
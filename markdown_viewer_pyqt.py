@@ -4,73 +4,32 @@ Markdown Viewer - PyQt5 application to display markdown content with proper form
 """
 import sys
 import re
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QScrollArea, 
-                            QWidget, QTextEdit, QLabel, QSizePolicy, QFrame)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QTextCursor, QTextCharFormat, QColor
-
-class CodeBlock(QTextEdit):
-    """Widget for displaying code blocks with proper formatting"""
-    def __init__(self, text, parent=None):
-        super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Courier New", 10))
-        self.setStyleSheet("""
-            QTextEdit {
-                background-color: #f5f5f5;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 10px;
-                margin: 10px 0;
-            }
-        """)
-        self.setText(text)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Set fixed height based on content with some padding
-        doc_height = self.document().size().height()
-        self.setMinimumHeight(min(int(doc_height + 30), 300))
-        
-        # Disable text wrapping for code blocks to preserve formatting
-        self.setLineWrapMode(QTextEdit.NoWrap)
-
-class TextBlock(QTextEdit):
-    """Widget for displaying regular text with proper formatting"""
-    def __init__(self, text, parent=None):
-        super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Arial", 11))
-        self.setStyleSheet("""
-            QTextEdit {
-                border: none;
-                background-color: transparent;
-                line-height: 1.4;
-                margin: 5px 0;
-            }
-        """)
-        self.setText(text)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
-        
-        # Enable text wrapping for regular text
-        self.setLineWrapMode(QTextEdit.WidgetWidth)
-        
-        # Set fixed height based on content
-        doc_height = self.document().size().height()
-        self.setMinimumHeight(int(doc_height + 20))
-        
-        # Set document margins
-        document = self.document()
-        document.setDocumentMargin(10)
-
-class Separator(QFrame):
-    """Simple horizontal separator line"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setFrameShape(QFrame.HLine)
-        self.setFrameShadow(QFrame.Sunken)
-        self.setStyleSheet("margin: 10px 0;")
+from html import escape
+from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QTextBrowser
+
+# Code fence patterns, compiled once: splitting out ``` blocks, and stripping
+# the opening fence (with language identifier) and closing fence in one pass
+FENCE_SPLIT = re.compile(r'(```[\s\S]*?```)')
+FENCE_STRIP = re.compile(r'\A```\w*\n|```\Z')
+
+# Inline styles for the two kinds of block in the rendered HTML
+TEXT_STYLE = "font-family: Arial; font-size: 11pt; white-space: pre-wrap; margin: 5px 0;"
+CODE_STYLE = "font-family: 'Courier New'; font-size: 10pt; background-color: #f5f5f5; margin: 10px 0;"
+
+def markdown_to_html(markdown_text):
+    """Convert markdown to HTML, with code fences as <pre> blocks and text kept verbatim"""
+    blocks = []
+    for part in FENCE_SPLIT.split(markdown_text):
+        if part.strip():
+            if part.startswith('```') and part.endswith('```'):
+                # Code block, fence markers and language identifier removed
+                code = escape(FENCE_STRIP.sub('', part).rstrip('\n'))
+                blocks.append(f'<pre style="{CODE_STYLE}">{code}</pre>')
+            else:
+                # Regular text, line breaks preserved by pre-wrap
+                text = escape(part.strip('\n'))
+                blocks.append(f'<p style="{TEXT_STYLE}">{text}</p>')
+    return "".join(blocks)
 
 class MarkdownViewer(QMainWindow):
     """Main window for the Markdown Viewer application"""
@@ -88,58 +47,23 @@ class MarkdownViewer(QMainWindow):
         self.main_widget = QWidget()
         self.main_layout = QVBoxLayout(self.main_widget)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
-        self.main_layout.setSpacing(0)  # We'll add spacing with our widgets
+        self.main_layout.setSpacing(0)
         
-        # Scroll area for content
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        # A single read-only browser holds the whole document and scrolls itself
+        self.text_view = QTextBrowser()
+        self.text_view.setOpenExternalLinks(True)
+        self.text_view.document().setDocumentMargin(10)
         
-        # Content widget and layout
-        self.content_widget = QWidget()
-        self.content_layout = QVBoxLayout(self.content_widget)
-        self.content_layout.setContentsMargins(10, 10, 10, 10)
-        self.content_layout.setSpacing(15)  # Space between blocks
-        
-        # Set content widget in scroll area
-        self.scroll_area.setWidget(self.content_widget)
-        
-        # Add scroll area to main layout
-        self.main_layout.addWidget(self.scroll_area)
+        # Add text view to main layout
+        self.main_layout.addWidget(self.text_view)
         
         # Set main widget
         self.setCentralWidget(self.main_widget)
     
     def render_markdown(self, markdown_text):
         """Parse and render markdown content"""
-        # Split the markdown by code blocks
-        parts = re.split(r'(```[\s\S]*?```)', markdown_text)
-        
-        for part in parts:
-            if part.strip():
-                if part.startswith('```') and part.endswith('```'):
-                    # Code block
-                    # Remove the code fence markers and language identifier if present
-                    code_content = re.sub(r'^```\w*\n', '', part)
-                    code_content = re.sub(r'```$', '', code_content)
-                    
-                    # Add vertical padding before code block
-                    self.content_layout.addSpacing(10)
-                    
-                    # Add code block
-                    code_block = CodeBlock(code_content)
-                    self.content_layout.addWidget(code_block)
-                    
-                    # Add vertical padding after code block
-                    self.content_layout.addSpacing(10)
-                else:
-                    # Regular text
-                    text_block = TextBlock(part)
-                    self.content_layout.addWidget(text_block)
-        
-        # Add stretch to push content to the top
-        self.content_layout.addStretch()
+        # One document, laid out once, instead of a widget per block
+        self.text_view.setHtml(markdown_to_html(markdown_text))
 
 def show_markdown(markdown_text):
     """Show markdown content in a new window"""
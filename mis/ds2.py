@@ -7,7 +7,8 @@ pygame.init()
 
 # Window
 WIDTH, HEIGHT = 1200, 720
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+# SCALED lets SDL scale the window on high-DPI / small screens, DOUBLEBUF avoids tearing
+WIN = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.SCALED)
 pygame.display.set_caption("Tree Visualizer - Inorder / Preorder / Postorder")
 
 # Layout
@@ -31,19 +32,42 @@ CODE_HL = (255, 245, 200)
 FONT = pygame.font.SysFont("consolas", 18)
 BIG = pygame.font.SysFont("consolas", 28)
 
+# Rendered text by (font, text, color); the strings drawn each frame repeat,
+# so each is rasterized once
+_text_cache = {}
+
+
+def render_cached(font, text, color):
+    key = (font, text, color)
+    surf = _text_cache.get(key)
+    if surf is None:
+        surf = _text_cache[key] = font.render(text, True, color).convert_alpha()
+    return surf
+
+
 # Node radius
 R = 24
 
-# Limit logs
+# Limit logs (only the last MAX_LOGS lines are ever shown, so only those are kept)
 MAX_LOGS = 8
 
+# Regions that change between traversal steps: code lines (with the current-line
+# highlight) and the visible log lines
+CODE_RECT = pygame.Rect(LEFT_W + 10, 42, RIGHT_W - 20, 24 * 6)
+LOG_RECT = pygame.Rect(0, HEIGHT - LOG_PANEL_H + 40, WIDTH, LOG_PANEL_H - 40)
 
-# ====== Tree node ======
-class Node:
-    def __init__(self, val):
-        self.val = val
-        self.left = None
-        self.right = None
+# Autoplay: a timer event posted every AUTO_STEP_MS while autoplay is on
+AUTO_STEP_EVENT = pygame.USEREVENT + 1
+AUTO_STEP_MS = 600
+
+# Shared empty default for the path_edges argument
+EMPTY = frozenset()
+
+
+# ====== Tree storage ======
+# A tree is three parallel lists indexed by node id: (vals, left, right).
+# left/right hold child ids, NO_CHILD marks a missing child, and the root is id 0.
+NO_CHILD = -1
 
 
 # ====== Utility: build example tree ======
@@ -55,68 +79,97 @@ def build_sample_tree():
     #     30      70
     #    /  \    /  \
     #   20  40  60  90
-    root = Node(50)
-    root.left = Node(30)
-    root.right = Node(70)
-    root.left.left = Node(20)
-    root.left.right = Node(40)
-    root.right.left = Node(60)
-    root.right.right = Node(90)
-    return root
+    vals = [50, 30, 70, 20, 40, 60, 90]
+    left = [1, 3, 5, NO_CHILD, NO_CHILD, NO_CHILD, NO_CHILD]
+    right = [2, 4, 6, NO_CHILD, NO_CHILD, NO_CHILD, NO_CHILD]
+    return vals, left, right
 
 
 # ====== Compute node positions for pretty layout ======
-def compute_positions(root, x, y, dx, positions):
-    if root is None:
-        return
-    positions[root.val] = (x, y)
-    # reduce dx each level
-    if root.left:
-        compute_positions(root.left, x - dx, y + 100, dx // 2, positions)
-    if root.right:
-        compute_positions(root.right, x + dx, y + 100, dx // 2, positions)
+def compute_positions(tree, x, y, dx):
+    vals, left, right = tree
+    # positions indexed by node id, filled with an explicit stack
+    positions = [None] * len(vals)
+    stack = [(0, x, y, dx)] if vals else []
+    while stack:
+        i, x, y, dx = stack.pop()
+        positions[i] = (x, y)
+        # halve dx each level
+        if right[i] != NO_CHILD:
+            stack.append((right[i], x + dx, y + 100, dx * 0.5))
+        if left[i] != NO_CHILD:
+            stack.append((left[i], x - dx, y + 100, dx * 0.5))
+    return positions
+
+
+# ====== Edge polyline: walk down every edge and back up again ======
+def edge_tour(tree, positions):
+    vals, left, right = tree
+    points = []
+    # ~i (negative) on the stack means "come back up to node i"
+    stack = [0] if vals else []
+    while stack:
+        i = stack.pop()
+        if i < 0:
+            points.append(positions[~i])
+            continue
+        points.append(positions[i])
+        for child in (right[i], left[i]):
+            if child != NO_CHILD:
+                stack.append(~i)
+                stack.append(child)
+    return points
+
+
+# ====== Node sprites: circle and label pre-rendered per node and state color ======
+NODE_COLORS = (BLUE, RED, GREEN)
+
+
+def make_node_sprite(val, color):
+    # SRCALPHA and converted to the display format, so per-frame blits skip conversion
+    sprite = pygame.Surface((2 * R + 1, 2 * R + 1), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.circle(sprite, color, (R, R), R)
+    text = FONT.render(str(val), True, WHITE)
+    sprite.blit(text, (R - text.get_width() // 2, R - text.get_height() // 2))
+    return sprite
+
+
+def sprite_positions(positions):
+    # top-left blit corner of each node sprite, computed once per layout
+    return [(int(x) - R, int(y) - R) for x, y in positions]
+
+
+def build_node_sprites(tree):
+    vals = tree[0]
+    # sprites[node id][color]
+    return [{color: make_node_sprite(val, color) for color in NODE_COLORS} for val in vals]
 
 
 # ====== Draw tree with highlighting ======
-def draw_tree_surface(surface, root, positions, highlight=None, visited=set(), path_edges=set()):
-    # background for left area
-    pygame.draw.rect(surface, BG, (0, 0, LEFT_W, HEIGHT - LOG_PANEL_H))
-    # draw edges first
-    if root:
-        stack = [root]
-        while stack:
-            node = stack.pop()
-            if node.left:
-                u = positions[node.val]
-                v = positions[node.left.val]
-                color = RED if (node.val, node.left.val) in path_edges else BLACK
-                pygame.draw.line(surface, color, u, v, 3)
-                stack.append(node.left)
-            if node.right:
-                u = positions[node.val]
-                v = positions[node.right.val]
-                color = RED if (node.val, node.right.val) in path_edges else BLACK
-                pygame.draw.line(surface, color, u, v, 3)
-                stack.append(node.right)
-    # draw nodes
-    if root:
-        stack = [root]
-        while stack:
-            node = stack.pop()
-            x, y = positions[node.val]
-            if node.val == highlight:
-                col = RED
-            elif node.val in visited:
-                col = GREEN
-            else:
-                col = BLUE
-            pygame.draw.circle(surface, col, (int(x), int(y)), R)
-            text = FONT.render(str(node.val), True, WHITE)
-            surface.blit(text, (x - text.get_width() // 2, y - text.get_height() // 2))
-            if node.left:
-                stack.append(node.left)
-            if node.right:
-                stack.append(node.right)
+def draw_tree_surface(surface, tree, positions, sprites, sprite_pos, highlight=NO_CHILD, visited=None, path_edges=None):
+    # background and black edges come from the tree background (build_tree_bg);
+    # highlight is a node id and visited a bytearray flag per node id
+    if visited is None:
+        visited = bytes(len(tree[0]))
+    if path_edges is None:
+        path_edges = EMPTY
+    vals, left, right = tree
+    # path edges on top of the baked ones; path_edges[child id] is set for
+    # highlighted edges (see edge_between)
+    if any(path_edges):
+        for i in range(len(vals)):
+            for child in (left[i], right[i]):
+                if child != NO_CHILD and path_edges[child]:
+                    pygame.draw.line(surface, RED, positions[i], positions[child], 3)
+    # draw nodes: sprites already carry the centered label, sprite_pos the top-left corner
+    for i in range(len(vals)):
+        if i == highlight:
+            col = RED
+        elif visited[i]:
+            col = GREEN
+        else:
+            col = BLUE
+        surface.blit(sprites[i][col], sprite_pos[i])
 
 
 # ====== Code panels for three traversals ======
@@ -148,167 +201,270 @@ POSTORDER_CODE = [
 ]
 
 
-# ====== Draw code panel and highlight current line ======
-def draw_code_panel(surface, code_lines, current_line):
-    # background
+CODE_LINES = {
+    "inorder": INORDER_CODE,
+    "preorder": PREORDER_CODE,
+    "postorder": POSTORDER_CODE
+}
+
+# Each traversal's code lines rendered once, blitted every frame
+CODE_LINE_SURFS = {name: [FONT.render(line, True, BLACK).convert_alpha() for line in code] for name, code in CODE_LINES.items()}
+
+CONTROLS = [
+    "Controls:",
+    "SPACE to step",
+    "A to toggle autoplay",
+    "R to reset to menu",
+    "M to go to menu",
+    "ESC to quit"
+]
+
+
+INSTR_STRINGS = [
+    "Choose traversal type and press SPACE to start",
+    "1 - In-order",
+    "2 - Pre-order",
+    "3 - Post-order",
+    "A - toggle autoplay when visualizing",
+    "R - Reset to Menu at any time",
+    "ESC - Quit"
+]
+
+# Menu title and instructions rendered once
+MENU_TITLE_SURF = BIG.render("Tree Visualizer", True, BLACK).convert_alpha()
+INSTR_SURFS = [FONT.render(t, True, BLACK).convert_alpha() for t in INSTR_STRINGS]
+
+
+# ====== Static chrome: background, panel frames, titles and controls ======
+def build_static_bg():
+    surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+    surface.fill(BG)
+    # code panel background and title
     pygame.draw.rect(surface, WHITE, (LEFT_W, 0, RIGHT_W, HEIGHT - LOG_PANEL_H))
-    # title
-    title = BIG.render("Algorithm", True, BLACK)
-    surface.blit(title, (LEFT_W + 14, 8))
+    surface.blit(BIG.render("Algorithm", True, BLACK), (LEFT_W + 14, 8))
+    # controls at bottom of panel
+    for idx, c in enumerate(CONTROLS):
+        surface.blit(FONT.render(c, True, BLACK), (LEFT_W + 14, HEIGHT - LOG_PANEL_H - 120 + idx * 20))
+    # log console frame and title
+    y0 = HEIGHT - LOG_PANEL_H
+    pygame.draw.rect(surface, (30, 30, 30), (0, y0, WIDTH, LOG_PANEL_H))
+    surface.blit(BIG.render("Trace / Log", True, WHITE), (12, y0 + 6))
+    return surface
+
+
+# Drawn once, blitted at the start of every frame instead of redrawing the chrome
+STATIC_BG = build_static_bg()
+
+
+# ====== Tree background: STATIC_BG with the tree's edges baked in ======
+def build_tree_bg(edge_points):
+    # the layout is fixed for a traversal, so edges are drawn once, not every frame
+    surface = STATIC_BG.copy()
+    if len(edge_points) > 1:
+        pygame.draw.lines(surface, BLACK, False, edge_points, 3)
+    return surface
+
+
+# ====== Draw code lines and highlight current line ======
+def draw_code_panel_dynamic(surface, code_surfs, current_line):
     # code block area
     block_x = LEFT_W + 10
     block_y = 44
     line_h = 24
-    for i, line in enumerate(code_lines):
+    for i, txt in enumerate(code_surfs):
         y = block_y + i * line_h
         # highlight background for current line
         if i == current_line:
             pygame.draw.rect(surface, CODE_HL, (block_x, y - 2, RIGHT_W - 20, line_h))
-        txt = FONT.render(line, True, BLACK)
         surface.blit(txt, (block_x + 6, y))
-    # controls at bottom of panel
-    controls = [
-        "Controls:",
-        "SPACE to step",
-        "A to toggle autoplay",
-        "R to reset to menu",
-        "M to go to menu",
-        "ESC to quit"
-    ]
-    for idx, c in enumerate(controls):
-        surface.blit(FONT.render(c, True, BLACK), (LEFT_W + 14, HEIGHT - LOG_PANEL_H - 120 + idx * 20))
 
 
-# ====== Log console ======
+# ====== Log console lines (frame is part of STATIC_BG) ======
 def draw_logs(surface, logs):
     y0 = HEIGHT - LOG_PANEL_H
-    pygame.draw.rect(surface, (30, 30, 30), (0, y0, WIDTH, LOG_PANEL_H))
-    menu = BIG.render("Trace / Log", True, WHITE)
-    surface.blit(menu, (12, y0 + 6))
     # draw each log line
-    for i, line in enumerate(logs[-MAX_LOGS:]):
-        txt = FONT.render(line, True, (220, 220, 220))
+    for i, line in enumerate(logs):
+        txt = render_cached(FONT, line, (220, 220, 220))
         surface.blit(txt, (12, y0 + 40 + i * 18))
 
 
-# ====== Traversal generators. Each yield returns (lineno_index, action, node_val, log_msg, optional_edge) ======
-def inorder_steps(node):
+# ====== Traversal generators. Each yield returns (lineno_index, action, node_id, log_msg, optional_edge) ======
+# Iterative: an explicit stack of (node id, phase) replaces one generator per tree level,
+# so each step is yielded directly instead of being passed up through every ancestor
+def inorder_steps(tree):
+    vals, left, right = tree
     # code lines indexes align with INORDER_CODE list
-    if node is None:
-        return
-    # going left
-    yield (3, "go_left", node.val, f"Going left from {node.val}", None)
-    if node.left:
-        for step in inorder_steps(node.left):
-            yield step
-    # visit
-    yield (4, "visit", node.val, f"Visiting {node.val}", None)
-    # going right
-    yield (5, "go_right", node.val, f"Going right from {node.val}", None)
-    if node.right:
-        for step in inorder_steps(node.right):
-            yield step
-
-
-def preorder_steps(node):
-    if node is None:
-        return
-    # visit
-    yield (3, "visit", node.val, f"Visiting {node.val}", None)
-    # left
-    yield (4, "go_left", node.val, f"Going left from {node.val}", None)
-    if node.left:
-        for step in preorder_steps(node.left):
-            yield step
-    # right
-    yield (5, "go_right", node.val, f"Going right from {node.val}", None)
-    if node.right:
-        for step in preorder_steps(node.right):
-            yield step
-
-
-def postorder_steps(node):
-    if node is None:
-        return
-    # left
-    yield (3, "go_left", node.val, f"Going left from {node.val}", None)
-    if node.left:
-        for step in postorder_steps(node.left):
-            yield step
-    # right
-    yield (4, "go_right", node.val, f"Going right from {node.val}", None)
-    if node.right:
-        for step in postorder_steps(node.right):
-            yield step
-    # visit
-    yield (5, "visit", node.val, f"Visiting {node.val}", None)
+    stack = [(0, 0)] if vals else []
+    while stack:
+        i, phase = stack.pop()
+        val = vals[i]
+        if phase == 0:
+            # going left
+            yield (3, "go_left", i, f"Going left from {val}", None)
+            stack.append((i, 1))
+            if left[i] != NO_CHILD:
+                stack.append((left[i], 0))
+        else:
+            # visit
+            yield (4, "visit", i, f"Visiting {val}", None)
+            # going right
+            yield (5, "go_right", i, f"Going right from {val}", None)
+            if right[i] != NO_CHILD:
+                stack.append((right[i], 0))
+
+
+def preorder_steps(tree):
+    vals, left, right = tree
+    stack = [(0, 0)] if vals else []
+    while stack:
+        i, phase = stack.pop()
+        val = vals[i]
+        if phase == 0:
+            # visit
+            yield (3, "visit", i, f"Visiting {val}", None)
+            # left
+            yield (4, "go_left", i, f"Going left from {val}", None)
+            stack.append((i, 1))
+            if left[i] != NO_CHILD:
+                stack.append((left[i], 0))
+        else:
+            # right
+            yield (5, "go_right", i, f"Going right from {val}", None)
+            if right[i] != NO_CHILD:
+                stack.append((right[i], 0))
+
+
+def postorder_steps(tree):
+    vals, left, right = tree
+    stack = [(0, 0)] if vals else []
+    while stack:
+        i, phase = stack.pop()
+        val = vals[i]
+        if phase == 0:
+            # left
+            yield (3, "go_left", i, f"Going left from {val}", None)
+            stack.append((i, 1))
+            if left[i] != NO_CHILD:
+                stack.append((left[i], 0))
+        elif phase == 1:
+            # right
+            yield (4, "go_right", i, f"Going right from {val}", None)
+            stack.append((i, 2))
+            if right[i] != NO_CHILD:
+                stack.append((right[i], 0))
+        else:
+            # visit
+            yield (5, "visit", i, f"Visiting {val}", None)
 
 
 # ====== Simple helper: highlight an edge when moving between parent and child ======
-def edge_between(parent_val, child_val):
-    return (parent_val, child_val)
+# Every node but the root has exactly one parent edge, so edges are identified by
+# their child's id and path_edges is a bytearray flag per id instead of a set of pairs
+def edge_between(parent_id, child_id):
+    return child_id
 
 
 # ====== App main ======
 def main():
-    clock = pygame.time.Clock()
     run = True
     state = "menu"     # menu or visualize
     traversal = None   # "inorder", "preorder", "postorder"
     autoplay = False
 
     # scene variables
-    root = None
-    positions = {}
-    generator = None
-    current_highlight = None
-    visited = set()
-    logs = []
-    path_edges = set()
+    tree = None
+    positions = []
+    sprites = []
+    sprite_pos = []
+    tree_bg = STATIC_BG
+    steps = None       # precomputed step tuples for the current traversal
+    step_idx = 0
+    last_line = -1     # code line of the last step, highlighted in the code panel
+    current_highlight = NO_CHILD   # node id
+    visited = bytearray()          # 1 per visited node id
+    logs = deque(maxlen=MAX_LOGS)
+    path_edges = bytearray()
+    needs_redraw = True
+    full_redraw = True   # False: only step-dependent regions are repainted
+
+    def set_autoplay(on):
+        nonlocal autoplay
+        autoplay = on
+        # the step timer only runs while autoplay is on
+        pygame.time.set_timer(AUTO_STEP_EVENT, AUTO_STEP_MS if on else 0)
+
+    def advance_step():
+        nonlocal steps, step_idx, last_line, current_highlight
+        if step_idx < len(steps):
+            # a step tuple: (lineno_index, action, node_id, log_msg, optional_edge)
+            lineno, action, node_id, log_msg, _ = steps[step_idx]
+            step_idx += 1
+            # record last line to highlight
+            last_line = lineno
+            # enact action
+            if action == "visit":
+                visited[node_id] = 1
+                current_highlight = node_id
+            elif action in ("go_left", "go_right"):
+                # highlight movement: mark parent as highlight briefly, add log
+                current_highlight = node_id
+            logs.append(log_msg)
+        else:
+            logs.append("Traversal finished")
+            set_autoplay(False)
+            steps = None
 
     while run:
-        WIN.fill(BG)
-
-        # MENU SCREEN
-        if state == "menu":
-            # left: title and options
-            pygame.draw.rect(WIN, BG, (0, 0, LEFT_W, HEIGHT - LOG_PANEL_H))
-            title = BIG.render("Tree Visualizer", True, BLACK)
-            WIN.blit(title, (40, 18))
-            instr = [
-                "Choose traversal type and press SPACE to start",
-                "1 - In-order",
-                "2 - Pre-order",
-                "3 - Post-order",
-                "A - toggle autoplay when visualizing",
-                "R - Reset to Menu at any time",
-                "ESC - Quit"
-            ]
-            for i, t in enumerate(instr):
-                WIN.blit(FONT.render(t, True, BLACK), (40, 80 + i * 28))
-            # right: show algorithm preview for selection or default
-            draw_code_panel(WIN, INORDER_CODE if traversal != "preorder" and traversal != "postorder" else (PREORDER_CODE if traversal == "preorder" else POSTORDER_CODE), -1)
-            # logs
-            draw_logs(WIN, logs)
-
-        # VISUALIZATION SCREEN
-        elif state == "visualize":
-            # draw tree area with highlights
-            draw_tree_surface(WIN, root, positions, highlight=current_highlight, visited=visited, path_edges=path_edges)
-            # draw code panel according to traversal
-            code_lines = INORDER_CODE if traversal == "inorder" else (PREORDER_CODE if traversal == "preorder" else POSTORDER_CODE)
-            # current_line derived from last yielded step; map to safe index
-            current_line = last_line if 'last_line' in locals() else -1
-            draw_code_panel(WIN, code_lines, current_line)
-            # draw logs
-            draw_logs(WIN, logs)
-
-        # Event loop
-        for event in pygame.event.get():
+        # redraw only after something changed; an idle screen is left as is
+        if needs_redraw:
+            # MENU SCREEN
+            if state == "menu":
+                WIN.blit(STATIC_BG, (0, 0))
+                # left: title and options
+                WIN.blit(MENU_TITLE_SURF, (40, 18))
+                for i, txt in enumerate(INSTR_SURFS):
+                    WIN.blit(txt, (40, 80 + i * 28))
+                # right: show algorithm preview for selection or default
+                draw_code_panel_dynamic(WIN, CODE_LINE_SURFS[traversal or "inorder"], -1)
+                # logs
+                draw_logs(WIN, logs)
+
+            # VISUALIZATION SCREEN
+            elif state == "visualize":
+                if full_redraw:
+                    WIN.blit(tree_bg, (0, 0))
+                else:
+                    # a step only changes the code highlight, the log lines and node
+                    # colors; node sprites are opaque circles that cover the previous
+                    # state, so just the two text regions are restored
+                    WIN.blit(tree_bg, CODE_RECT, CODE_RECT)
+                    WIN.blit(tree_bg, LOG_RECT, LOG_RECT)
+                # draw tree area with highlights
+                draw_tree_surface(WIN, tree, positions, sprites, sprite_pos, highlight=current_highlight, visited=visited, path_edges=path_edges)
+                # draw code panel according to traversal
+                draw_code_panel_dynamic(WIN, CODE_LINE_SURFS[traversal], last_line)
+                # draw logs
+                draw_logs(WIN, logs)
+            # update screen
+            pygame.display.flip()
+            needs_redraw = False
+            full_redraw = False
+
+        # Event loop: sleep until something happens (a key, a window event or an
+        # autoplay tick), then handle everything that is queued
+        for event in [pygame.event.wait()] + pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
+            if event.type == pygame.WINDOWEXPOSED:
+                needs_redraw = True
+                full_redraw = True
+            if event.type == AUTO_STEP_EVENT and state == "visualize" and steps:
+                advance_step()
+                needs_redraw = True
 
             if event.type == pygame.KEYDOWN:
+                # any key may change what is on screen
+                needs_redraw = True
                 # global keys
                 if event.key == pygame.K_ESCAPE:
                     run = False
@@ -316,14 +472,17 @@ def main():
                     # reset everything to menu
                     state = "menu"
                     traversal = None
-                    autoplay = False
-                    root = None
-                    positions = {}
-                    generator = None
-                    current_highlight = None
-                    visited = set()
-                    logs = []
-                    path_edges = set()
+                    set_autoplay(False)
+                    tree = None
+                    positions = []
+                    sprites = []
+                    sprite_pos = []
+                    tree_bg = STATIC_BG
+                    steps = None
+                    current_highlight = NO_CHILD
+                    visited.clear()
+                    logs.clear()
+                    path_edges.clear()
                 if state == "menu":
                     # select traversal
                     if event.key == pygame.K_1:
@@ -335,83 +494,34 @@ def main():
                     # start visualization
                     if event.key == pygame.K_SPACE and traversal:
                         # build tree and positions
-                        root = build_sample_tree()
-                        positions = {}
-                        compute_positions(root, LEFT_W // 2, TOP_MARGIN + 20, 220, positions)
+                        tree = build_sample_tree()
+                        positions = compute_positions(tree, LEFT_W // 2, TOP_MARGIN + 20, 220)
+                        sprites = build_node_sprites(tree)
+                        sprite_pos = sprite_positions(positions)
+                        tree_bg = build_tree_bg(edge_tour(tree, positions))
                         # init state
-                        visited = set()
-                        logs = []
-                        path_edges = set()
-                        current_highlight = None
-                        # create generator
+                        visited = bytearray(len(tree[0]))
+                        logs.clear()
+                        path_edges = bytearray(len(tree[0]))
+                        current_highlight = NO_CHILD
+                        # the tree is fixed, so compute every step up front
                         if traversal == "inorder":
-                            generator = inorder_steps(root)
+                            steps = list(inorder_steps(tree))
                         elif traversal == "preorder":
-                            generator = preorder_steps(root)
+                            steps = list(preorder_steps(tree))
                         else:
-                            generator = postorder_steps(root)
+                            steps = list(postorder_steps(tree))
+                        step_idx = 0
                         state = "visualize"
-                        autoplay = False
+                        set_autoplay(False)
+                        full_redraw = True
                 elif state == "visualize":
-                    # toggle autoplay
-                    if event.key == pygame.K_a:
-                        autoplay = not autoplay
+                    # toggle autoplay (a finished traversal has no steps left to play)
+                    if event.key == pygame.K_a and (autoplay or steps):
+                        set_autoplay(not autoplay)
                     # step when space and not autoplay
-                    if event.key == pygame.K_SPACE and not autoplay:
-                        if generator:
-                            try:
-                                step = next(generator)
-                                # a step tuple: (lineno_index, action, node_val, log_msg, optional_edge)
-                                lineno, action, node_val, log_msg, _ = step
-                                # record last line to highlight
-                                last_line = lineno
-                                # enact action
-                                if action == "visit":
-                                    visited.add(node_val)
-                                    current_highlight = node_val
-                                elif action in ("go_left", "go_right"):
-                                    # highlight movement: mark parent as highlight briefly, add log
-                                    current_highlight = node_val
-                                logs.append(log_msg)
-                                if len(logs) > 200:
-                                    logs = logs[-200:]
-                            except StopIteration:
-                                logs.append("Traversal finished")
-                                autoplay = False
-                                generator = None
-                    # autoplay stepping
-                    # handled in main loop below
-        # autoplay logic: take steps automatically at lower FPS
-        if state == "visualize" and autoplay and generator:
-            # control speed with tick time
-            # step roughly once per 600ms
-            # using clock.get_time is noisy, so use pygame.time.get_ticks
-            if not hasattr(main, "_last_auto"):
-                main._last_auto = 0
-            now = pygame.time.get_ticks()
-            if now - main._last_auto > 600:
-                try:
-                    step = next(generator)
-                    lineno, action, node_val, log_msg, _ = step
-                    last_line = lineno
-                    if action == "visit":
-                        visited.add(node_val)
-                        current_highlight = node_val
-                    elif action in ("go_left", "go_right"):
-                        current_highlight = node_val
-                    logs.append(log_msg)
-                    if len(logs) > 200:
-                        logs = logs[-200:]
-                except StopIteration:
-                    logs.append("Traversal finished")
-                    autoplay = False
-                    generator = None
-                main._last_auto = now
-
-        # limit frame rate
-        clock.tick(60)
-        # update screen
-        pygame.display.flip()
+                    if event.key == pygame.K_SPACE and not autoplay and steps:
+                        advance_step()
 
     pygame.quit()
 
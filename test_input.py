@@ -8,7 +8,7 @@ from tkinter import simpledialog, messagebox
 import random
 
 def gen_random_list(n):
-    return [random.randint(5, 100) for _ in range(n)]
+    return random.choices(range(5, 101), k=n)
 
 def get_user_input():
     """Get user input for custom numbers using tkinter dialog"""
@@ -1,8 +1,11 @@
 import pygame
 import random
+import re
 import time
 import sys
+import json
 from datetime import datetime
+from functools import lru_cache
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 
@@ -13,9 +16,18 @@ import pygame
 WIDTH = 1600
 HEIGHT = 1000
 NUM_ITEMS = 50  # More items for larger screen
+MAX_VALUE = 1000  # bars show values 1..MAX_VALUE, whatever the input source
+MAX_NUMBERS = 25  # at most this many bars from the dialog or the web app
 PADDING = 50
 BAR_GAP = 2
-SLEEP_MS = 60  # milliseconds pause between steps
+SLEEP_MS = 33  # milliseconds per frame while sorting
+STEPS_PER_FRAME = 3  # sort steps advanced per drawn frame
+RESIZE_SETTLE_MS = 100  # apply a window resize once no resize event came for this long
+RESIZE_MIN_DELTA = 4  # ignore resizes smaller than this (pixels)
+
+# input parsing: tokens are separated by spaces and/or commas
+INPUT_TOKEN = re.compile(r'[^\s,]+')
+INPUT_NUMBER = re.compile(r'[+-]?\d+')
 
 # colours
 BLACK = (0, 0, 0)
@@ -25,48 +37,53 @@ BAR_COLOR = (100, 200, 255)
 ACTIVE_COLOR = (255, 120, 120)
 TEXT_COLOR = (220, 220, 220)
 
+# The chart surface is 8-bit: bars are filled with these palette indices
+CHART_PALETTE = [BG, BAR_COLOR, ACTIVE_COLOR]
+BG_INDEX, BAR_INDEX, ACTIVE_INDEX = range(3)
+
 # Global variables for pygame objects (initialized later)
 screen = None
 font = None
 clock = None
+chart_surf = None  # offscreen 8-bit surface the bars are composed on
+drawn_key = None   # layout and texts of the frame on screen
+drawn_items = []   # bar values on screen
+drawn_active = ()  # highlighted bars on screen
+full_redraw = True  # set when the whole window has to be repainted
 
 def gen_random_list(n):
-    return [random.randint(5, 100) for _ in range(n)]
+    return random.choices(range(5, 101), k=n)
 
 def get_user_input():
     """Get user input for custom numbers using tkinter dialog"""
-    # Create a root window (hidden)
+    # Create a root window (hidden); it is destroyed however the dialog ends
     root = tk.Tk()
     root.withdraw()  # Hide the main window
-    
-    # Show welcome message
-    messagebox.showinfo("Sorting Algorithm Visualizer", 
-                       "Welcome to the Sorting Algorithm Visualizer!\n\n"
-                       "You can enter your own numbers or use random numbers.\n"
-                       "• Separate numbers with spaces or commas\n"
-                       "• Maximum 25 numbers allowed\n"
-                       "• Numbers should be between 1 and 1000")
-    
-    while True:
-        # Get user input
-        user_input = simpledialog.askstring("Enter Numbers", 
-                                          "Enter your numbers (or leave empty for random):\n"
-                                          "Examples: 10 5 8 3 7  or  10,5,8,3,7")
-        
-        if user_input is None:
-            # User clicked Cancel - use random numbers
-            root.destroy()
-            return gen_random_list(NUM_ITEMS)
-        
-        if not user_input.strip():
-            # User wants random numbers
-            root.destroy()
-            return gen_random_list(NUM_ITEMS)
+    try:
+        # Show welcome message
+        messagebox.showinfo("Sorting Algorithm Visualizer", 
+                           "Welcome to the Sorting Algorithm Visualizer!\n\n"
+                           "You can enter your own numbers or use random numbers.\n"
+                           "• Separate numbers with spaces or commas\n"
+                           f"• Maximum {MAX_NUMBERS} numbers allowed\n"
+                           f"• Numbers should be between 1 and {MAX_VALUE}")
         
-        # Parse input - handle both spaces and commas
-        try:
-            # Replace commas with spaces and split
-            numbers_str = user_input.replace(',', ' ').split()
+        while True:
+            # Get user input
+            user_input = simpledialog.askstring("Enter Numbers", 
+                                              "Enter your numbers (or leave empty for random):\n"
+                                              "Examples: 10 5 8 3 7  or  10,5,8,3,7")
+            
+            if user_input is None:
+                # User clicked Cancel - use random numbers
+                return gen_random_list(NUM_ITEMS)
+            
+            if not user_input.strip():
+                # User wants random numbers
+                return gen_random_list(NUM_ITEMS)
+            
+            # Parse input - tokens are separated by spaces and/or commas
+            numbers_str = INPUT_TOKEN.findall(user_input)
             
             if not numbers_str:
                 messagebox.showerror("Error", "Please enter at least one number.")
@@ -77,27 +94,27 @@ def get_user_input():
             invalid_numbers = []
             
             for num_str in numbers_str:
-                try:
-                    num = int(num_str)
-                    if num < 1 or num > 1000:
-                        invalid_numbers.append(f"{num} (out of range 1-1000)")
-                    else:
-                        numbers.append(num)
-                except ValueError:
+                if not INPUT_NUMBER.fullmatch(num_str):
                     invalid_numbers.append(f"'{num_str}' (not a number)")
+                    continue
+                num = int(num_str)
+                if num < 1 or num > MAX_VALUE:
+                    invalid_numbers.append(f"{num} (out of range 1-{MAX_VALUE})")
+                else:
+                    numbers.append(num)
             
             if invalid_numbers:
                 messagebox.showerror("Invalid Input", 
                                    f"Invalid numbers found:\n" + "\n".join(invalid_numbers) + 
-                                   "\n\nPlease try again with valid numbers (1-1000).")
+                                   f"\n\nPlease try again with valid numbers (1-{MAX_VALUE}).")
                 continue
             
             # All numbers were valid
-            if len(numbers) > 25:
+            if len(numbers) > MAX_NUMBERS:
                 messagebox.showwarning("Too Many Numbers", 
                                      f"You entered {len(numbers)} numbers.\n"
-                                     f"Using the first 25 numbers.")
-                numbers = numbers[:25]
+                                     f"Using the first {MAX_NUMBERS} numbers.")
+                numbers = numbers[:MAX_NUMBERS]
             
             # Show confirmation
             result = messagebox.askyesno("Confirm Numbers", 
@@ -105,14 +122,23 @@ def get_user_input():
                                        f"Proceed with these numbers?")
             
             if result:
-                root.destroy()
                 return numbers
-            else:
-                continue  # Let user try again
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Error parsing input: {e}\nPlease try again.")
-            continue
+            # otherwise let user try again
+    finally:
+        root.destroy()
+
+def load_numbers(source):
+    """Load the numbers handed over by the web app ('-' reads them from stdin)"""
+    try:
+        if source == '-':
+            data = json.load(sys.stdin)
+        else:
+            with open(source) as f:
+                data = json.load(f)
+        numbers = [num for num in map(int, data["numbers"]) if 0 < num <= MAX_VALUE][:MAX_NUMBERS]
+    except (OSError, ValueError, KeyError, TypeError, OverflowError):
+        return None
+    return numbers or None
 
 def render_text_antialiased(font, text, color):
     """Render text with anti-aliasing for better quality on Retina displays"""
@@ -123,23 +149,97 @@ def render_text_antialiased(font, text, color):
         # Fallback to regular rendering
         return font.render(text, True, color)
 
+@lru_cache(maxsize=2048)
+def render_cached(text, color):
+    """Rendered text surfaces for the current font; controls and value labels repeat every frame"""
+    return render_text_antialiased(font, text, color)
+
+TIME_COMPLEXITIES = {
+    "bubble": "O(n²) - Worst/Average, O(n) - Best",
+    "insertion": "O(n²) - Worst/Average, O(n) - Best", 
+    "selection": "O(n²) - All cases",
+    "quick": "O(n log n) - Average, O(n²) - Worst",
+    "merge": "O(n log n) - All cases",
+    "heap": "O(n log n) - All cases"
+}
+
 def get_time_complexity(algorithm):
-    complexities = {
-        "bubble": "O(n²) - Worst/Average, O(n) - Best",
-        "insertion": "O(n²) - Worst/Average, O(n) - Best", 
-        "selection": "O(n²) - All cases",
-        "quick": "O(n log n) - Average, O(n²) - Worst",
-        "merge": "O(n log n) - All cases",
-        "heap": "O(n log n) - All cases"
-    }
-    return complexities.get(algorithm, "")
+    return TIME_COMPLEXITIES.get(algorithm, "")
+
+# Static instruction text, drawn as prerendered blocks (see text_block)
+ALGORITHM_LINES = (
+    "SORTING ALGORITHMS:",
+    "B - Bubble Sort    I - Insertion Sort    S - Selection Sort",
+    "Q - Quick Sort     M - Merge Sort       H - Heap Sort"
+)
+CONTROL_LINES = (
+    "CONTROLS:",
+    "A - Ascending  |  D - Descending  |  SPACE - Start  |  R - Random",
+    "X - Instant Sort  |  ESC - Quit"
+)
+
+@lru_cache(maxsize=8)
+def text_block(lines, line_height=25):
+    """Lines rendered once onto an opaque BG surface, line_height apart"""
+    surfs = [render_cached(line, TEXT_COLOR) for line in lines]
+    block = pygame.Surface((max(txt.get_width() for txt in surfs),
+                            line_height * (len(surfs) - 1) + max(txt.get_height() for txt in surfs)))
+    block.fill(BG)
+    for idx, txt in enumerate(surfs):
+        block.blit(txt, (0, idx * line_height))
+    return block.convert()
+
+def get_chart_surface(width, height):
+    """Return the persistent chart surface, recreated when the window size changes"""
+    global chart_surf
+    if chart_surf is None or chart_surf.get_size() != (width, height):
+        chart_surf = pygame.Surface((width, height), depth=8)
+        chart_surf.set_palette(CHART_PALETTE)
+    return chart_surf
+
+def label_reach(max_val):
+    """Half the widest value label up to max_val; labels may spill onto neighbouring bars"""
+    digit_w = max(font.size(d)[0] for d in "0123456789")
+    # one spare digit covers glyph overhang and the rounding of the label center
+    return (len(str(max_val)) + 1) * digit_w // 2 + 2
+
+@lru_cache(maxsize=16)
+def bar_layout(n, max_val, width, chart_area_height):
+    """Bar width, bar x positions and a value -> bar height table (values are
+    bounded by MAX_VALUE); these only change with the window size or the data,
+    not from frame to frame"""
+    usable_width = width - 2 * PADDING
+    bar_width = max(1, (usable_width - (n - 1) * BAR_GAP) // n)
+    xs = [PADDING + i * (bar_width + BAR_GAP) for i in range(n)]
+    scale = chart_area_height / max_val
+    heights = [int(val * scale) for val in range(max_val + 1)]
+    return bar_width, xs, heights
+
+def draw_bar(chart, i, val, active_indices, layout):
+    """Fill bar i on the chart surface with its palette index"""
+    bar_width, xs, heights = layout
+    bar_h = heights[val]
+    index = ACTIVE_INDEX if i in active_indices else BAR_INDEX
+    chart.fill(index, (xs[i], chart.get_height() - bar_h, bar_width, bar_h))
+
+def draw_label(i, val, layout, base_y):
+    """Put the value label of bar i on the screen above its bar (base_y is
+    the bottom of the bars); labels are antialiased, so not on the 8-bit chart"""
+    bar_width, xs, heights = layout
+    bar_h = heights[val]
+    # small value label (only show for larger bars to avoid clutter)
+    if bar_h > 30:
+        txt = render_cached(str(val), TEXT_COLOR)
+        screen.blit(txt, txt.get_rect(center=(xs[i] + bar_width / 2, base_y - bar_h - 10)))
 
 def draw(items, active_indices=None, title="", time_complexity="", execution_time=""):
-    screen.fill(BG)
+    global drawn_key, drawn_active, full_redraw
     active_indices = active_indices or []
     n = len(items)
     if n == 0:
+        screen.fill(BG)
         pygame.display.flip()
+        full_redraw = True
         return
 
     # Reserve space for instructions at the top and bottom
@@ -148,37 +248,61 @@ def draw(items, active_indices=None, title="", time_complexity="", execution_tim
     chart_area_height = HEIGHT - top_height - bottom_height - PADDING
     
     # compute bar size
-    usable_width = WIDTH - 2 * PADDING
-    bar_width = max(1, (usable_width - (n - 1) * BAR_GAP) // n)
     max_val = max(items)
-    scale = chart_area_height / max_val
+    layout = bar_layout(n, max_val, WIDTH, chart_area_height)
+    bar_width, xs, _ = layout
 
-    # Draw bars in the middle area
+    # Bars are composed on the chart surface (the band between the top and
+    # bottom text) with plain fills, then blitted to the screen with the
+    # value labels on top
+    chart = get_chart_surface(WIDTH, max(1, HEIGHT - bottom_height - top_height))
+    base_y = top_height + chart.get_height()
+    key = (WIDTH, HEIGHT, n, max_val, title, time_complexity, execution_time)
+    if not full_redraw and key == drawn_key:
+        # Same layout and texts: repaint only the bars whose value or
+        # highlight changed since the last frame
+        dirty = {i for i in range(n) if items[i] != drawn_items[i]}
+        dirty.update(drawn_active)
+        dirty.update(active_indices)
+        if len(dirty) * 2 <= n:
+            step = bar_width + BAR_GAP
+            reach = max(bar_width // 2 + 1, label_reach(max_val))
+            # bars (and labels) that can reach into a dirty column
+            k = 2 * reach // step + 1
+            rects = []
+            for i in sorted(dirty):
+                cx = xs[i] + bar_width // 2
+                area = pygame.Rect(cx - reach, 0, 2 * reach, chart.get_height())
+                near = range(max(0, i - k), min(n, i + k + 1))
+                chart.set_clip(area)
+                chart.fill(BG_INDEX)
+                for j in near:
+                    draw_bar(chart, j, items[j], active_indices, layout)
+                rect = screen.blit(chart, area.move(0, top_height), area)
+                screen.set_clip(rect)
+                for j in near:
+                    draw_label(j, items[j], layout, base_y)
+                screen.set_clip(None)
+                rects.append(rect)
+            chart.set_clip(None)
+            drawn_items[:] = items
+            drawn_active = tuple(active_indices)
+            pygame.display.update(rects)
+            return
+
+    screen.fill(BG)
+    chart.fill(BG_INDEX)
     for i, val in enumerate(items):
-        x = PADDING + i * (bar_width + BAR_GAP)
-        bar_h = int(val * scale)
-        y = HEIGHT - bottom_height - bar_h
-        color = ACTIVE_COLOR if i in active_indices else BAR_COLOR
-        rect = pygame.Rect(x, y, bar_width, bar_h)
-        pygame.draw.rect(screen, color, rect)
-        # small value label (only show for larger bars to avoid clutter)
-        if bar_h > 30:
-            txt = render_text_antialiased(font, str(val), TEXT_COLOR)
-            txt_rect = txt.get_rect(center=(x + bar_width / 2, y - 10))
-            screen.blit(txt, txt_rect)
-
-    # Top section - Status and algorithm info
-    top_lines = [
-        f"Status: {title}",
-        "",
-        "SORTING ALGORITHMS:",
-        "B - Bubble Sort    I - Insertion Sort    S - Selection Sort",
-        "Q - Quick Sort     M - Merge Sort       H - Heap Sort"
-    ]
-    for idx, line in enumerate(top_lines):
-        if line:  # Only draw non-empty lines
-            txt = render_text_antialiased(font, line, TEXT_COLOR)
-            screen.blit(txt, (PADDING, 20 + idx * 25))
+        draw_bar(chart, i, val, active_indices, layout)
+    screen.blit(chart, (0, top_height))
+    for i, val in enumerate(items):
+        draw_label(i, val, layout, base_y)
+
+    # Top section - Status and algorithm info; only the status line changes,
+    # the algorithm list (lines 2-4) is a prerendered block
+    txt = render_cached(f"Status: {title}", TEXT_COLOR)
+    screen.blit(txt, (PADDING, 20))
+    screen.blit(text_block(ALGORITHM_LINES), (PADDING, 20 + 2 * 25))
     
     # Right side box for time complexity and execution time
     if time_complexity or execution_time:
@@ -193,12 +317,14 @@ def draw(items, active_indices=None, title="", time_complexity="", execution_tim
             box_x = PADDING
             box_width = WIDTH - 2 * PADDING
         
-        # Draw box background
-        pygame.draw.rect(screen, (40, 40, 45), (box_x, box_y, box_width, box_height))
-        pygame.draw.rect(screen, (100, 100, 110), (box_x, box_y, box_width, box_height), 2)
+        # Draw box: fill it with the border colour, then the background inset
+        # by the 2px border (two plain fills instead of draw.rect)
+        box = pygame.Rect(box_x, box_y, box_width, box_height)
+        screen.fill((100, 100, 110), box)
+        screen.fill((40, 40, 45), box.inflate(-4, -4))
         
         # Box title
-        title_txt = render_text_antialiased(font, "ALGORITHM INFO", TEXT_COLOR)
+        title_txt = render_cached("ALGORITHM INFO", TEXT_COLOR)
         screen.blit(title_txt, (box_x + 15, box_y + 15))
         
         # Time complexity - wrap text if too long
@@ -208,45 +334,46 @@ def draw(items, active_indices=None, title="", time_complexity="", execution_tim
             if len(complexity_text) > 50:
                 parts = complexity_text.split(" - ")
                 if len(parts) >= 2:
-                    complexity_txt1 = render_text_antialiased(font, parts[0], TEXT_COLOR)
-                    complexity_txt2 = render_text_antialiased(font, parts[1], TEXT_COLOR)
+                    complexity_txt1 = render_cached(parts[0], TEXT_COLOR)
+                    complexity_txt2 = render_cached(parts[1], TEXT_COLOR)
                     screen.blit(complexity_txt1, (box_x + 15, box_y + 45))
                     screen.blit(complexity_txt2, (box_x + 15, box_y + 65))
                 else:
-                    complexity_txt = render_text_antialiased(font, complexity_text[:45] + "...", TEXT_COLOR)
+                    complexity_txt = render_cached(complexity_text[:45] + "...", TEXT_COLOR)
                     screen.blit(complexity_txt, (box_x + 15, box_y + 45))
             else:
-                complexity_txt = render_text_antialiased(font, complexity_text, TEXT_COLOR)
+                complexity_txt = render_cached(complexity_text, TEXT_COLOR)
                 screen.blit(complexity_txt, (box_x + 15, box_y + 45))
         
         # Execution time
         if execution_time:
             time_text = f"Execution Time: {execution_time}"
-            time_txt = render_text_antialiased(font, time_text, TEXT_COLOR)
+            time_txt = render_cached(time_text, TEXT_COLOR)
             screen.blit(time_txt, (box_x + 15, box_y + 95))
 
     # Bottom section - Controls
-    bottom_lines = [
-        "CONTROLS:",
-        "A - Ascending  |  D - Descending  |  SPACE - Start  |  R - Random",
-        "X - Instant Sort  |  ESC - Quit"
-    ]
-    for idx, line in enumerate(bottom_lines):
-        txt = render_text_antialiased(font, line, TEXT_COLOR)
-        screen.blit(txt, (PADDING, HEIGHT - bottom_height + 20 + idx * 25))
+    screen.blit(text_block(CONTROL_LINES), (PADDING, HEIGHT - bottom_height + 20))
 
+    drawn_key = key
+    drawn_items[:] = items
+    drawn_active = tuple(active_indices)
+    full_redraw = False
     pygame.display.flip()
 
 def bubble_sort_gen(arr, ascending=True):
     a = arr[:]
+    # direction as a sign: comparing s * x keeps both orders strict, so
+    # equal values are never swapped
+    s = 1 if ascending else -1
     n = len(a)
     for i in range(n):
         swapped = False
         for j in range(0, n - i - 1):
             # highlight comparing pair
             yield a, (j, j + 1)
-            if (a[j] > a[j + 1]) == ascending:
-                a[j], a[j + 1] = a[j + 1], a[j]
+            x, y = a[j], a[j + 1]
+            if s * x > s * y:
+                a[j], a[j + 1] = y, x
                 swapped = True
                 yield a, (j, j + 1)
         if not swapped:
@@ -255,11 +382,12 @@ def bubble_sort_gen(arr, ascending=True):
 
 def insertion_sort_gen(arr, ascending=True):
     a = arr[:]
+    s = 1 if ascending else -1
     for i in range(1, len(a)):
         key = a[i]
         j = i - 1
         yield a, (i,)
-        while j >= 0 and (a[j] > key) == ascending:
+        while j >= 0 and s * a[j] > s * key:
             a[j + 1] = a[j]
             j -= 1
             yield a, (j + 1, j + 2)
@@ -270,48 +398,50 @@ def insertion_sort_gen(arr, ascending=True):
 def selection_sort_gen(arr, ascending=True):
     a = arr[:]
     n = len(a)
+    # the suffix scan is a single min/max call (first extreme, like a strict
+    # compare) and shows as one step per sweep
+    pick = min if ascending else max
     for i in range(n):
-        min_idx = i
-        yield a, (i,)
-        for j in range(i + 1, n):
-            yield a, (i, j)
-            if (a[j] < a[min_idx]) == ascending:
-                min_idx = j
+        min_idx = pick(range(i, n), key=a.__getitem__)
+        yield a, (i, min_idx)
         if min_idx != i:
             a[i], a[min_idx] = a[min_idx], a[i]
             yield a, (i, min_idx)
     yield a, ()
 
 def quick_sort_gen(arr, ascending=True):
-    def _quick_sort(a, low, high):
+    s = 1 if ascending else -1
+    a = arr[:]
+    # ranges still to partition; the left part is pushed last so it is
+    # sorted first, like the recursive version
+    stack = [(0, len(a) - 1)]
+    while stack:
+        low, high = stack.pop()
         if low < high:
             # Partition
             pivot_idx = low
             pivot = a[high]
+            s_pivot = s * pivot
             yield a, (high,)
             
             for i in range(low, high):
                 yield a, (i, high)
-                if (a[i] < pivot) == ascending:
-                    a[pivot_idx], a[i] = a[i], a[pivot_idx]
+                val = a[i]
+                if s * val < s_pivot:
+                    a[pivot_idx], a[i] = val, a[pivot_idx]
                     yield a, (pivot_idx, i)
                     pivot_idx += 1
             
             a[pivot_idx], a[high] = a[high], a[pivot_idx]
             yield a, (pivot_idx, high)
             
-            # Recursive calls
-            for step in _quick_sort(a, low, pivot_idx - 1):
-                yield step
-            for step in _quick_sort(a, pivot_idx + 1, high):
-                yield step
-    
-    a = arr[:]
-    for step in _quick_sort(a, 0, len(a) - 1):
-        yield step
+            stack.append((pivot_idx + 1, high))
+            stack.append((low, pivot_idx - 1))
     yield a, ()
 
 def merge_sort_gen(arr, ascending=True):
+    s = 1 if ascending else -1
+
     def _merge(a, left, mid, right):
         left_arr = a[left:mid + 1]
         right_arr = a[mid + 1:right + 1]
@@ -321,7 +451,7 @@ def merge_sort_gen(arr, ascending=True):
         
         while i < len(left_arr) and j < len(right_arr):
             yield a, (left + i, mid + 1 + j)
-            if (left_arr[i] <= right_arr[j]) == ascending:
+            if s * left_arr[i] <= s * right_arr[j]:
                 a[k] = left_arr[i]
                 i += 1
             else:
@@ -330,72 +460,79 @@ def merge_sort_gen(arr, ascending=True):
             yield a, (k,)
             k += 1
         
-        while i < len(left_arr):
-            a[k] = left_arr[i]
-            yield a, (k,)
-            i += 1
-            k += 1
-        
-        while j < len(right_arr):
-            a[k] = right_arr[j]
-            yield a, (k,)
-            j += 1
-            k += 1
+        # the rest of either half is already in order: copy it as one block
+        if k <= right:
+            a[k:right + 1] = left_arr[i:] if i < len(left_arr) else right_arr[j:]
+            yield a, tuple(range(k, right + 1))
     
-    def _merge_sort(a, left, right):
+    a = arr[:]
+    # (left, right, halves_sorted): a range is pushed back with
+    # halves_sorted=True under its two halves and merged once both are done
+    stack = [(0, len(a) - 1, False)]
+    while stack:
+        left, right, halves_sorted = stack.pop()
         if left < right:
             mid = (left + right) // 2
-            for step in _merge_sort(a, left, mid):
-                yield step
-            for step in _merge_sort(a, mid + 1, right):
-                yield step
-            for step in _merge(a, left, mid, right):
-                yield step
-    
-    a = arr[:]
-    for step in _merge_sort(a, 0, len(a) - 1):
-        yield step
+            if halves_sorted:
+                yield from _merge(a, left, mid, right)
+            else:
+                stack.append((left, right, True))
+                stack.append((mid + 1, right, False))
+                stack.append((left, mid, False))
     yield a, ()
 
 def heap_sort_gen(arr, ascending=True):
+    s = 1 if ascending else -1
+
     def heapify(a, n, i):
-        largest = i
-        left = 2 * i + 1
-        right = 2 * i + 2
-        
-        if left < n:
-            yield a, (i, left)
-            if (a[left] > a[largest]) == ascending:
-                largest = left
-        
-        if right < n:
-            yield a, (i, right)
-            if (a[right] > a[largest]) == ascending:
-                largest = right
-        
-        if largest != i:
-            a[i], a[largest] = a[largest], a[i]
+        # sift a[i] down; each swap continues from the child it moved to
+        while True:
+            largest = i
+            largest_val = a[i]
+            left = 2 * i + 1
+            right = 2 * i + 2
+            
+            if left < n:
+                yield a, (i, left)
+                if s * a[left] > s * largest_val:
+                    largest, largest_val = left, a[left]
+            
+            if right < n:
+                yield a, (i, right)
+                if s * a[right] > s * largest_val:
+                    largest, largest_val = right, a[right]
+            
+            if largest == i:
+                return
+            a[i], a[largest] = largest_val, a[i]
             yield a, (i, largest)
-            for step in heapify(a, n, largest):
-                yield step
+            i = largest
     
     a = arr[:]
     n = len(a)
     
     # Build max heap
     for i in range(n // 2 - 1, -1, -1):
-        for step in heapify(a, n, i):
-            yield step
+        yield from heapify(a, n, i)
     
     # Extract elements one by one
     for i in range(n - 1, 0, -1):
         a[0], a[i] = a[i], a[0]
         yield a, (0, i)
-        for step in heapify(a, i, 0):
-            yield step
+        yield from heapify(a, i, 0)
     
     yield a, ()
 
+# Generator for each selectable algorithm, looked up when SPACE starts a sort
+SORT_GENERATORS = {
+    "bubble": bubble_sort_gen,
+    "insertion": insertion_sort_gen,
+    "selection": selection_sort_gen,
+    "quick": quick_sort_gen,
+    "merge": merge_sort_gen,
+    "heap": heap_sort_gen,
+}
+
 def handle_quit_events():
     for ev in pygame.event.get():
         if ev.type == pygame.QUIT:
@@ -405,17 +542,18 @@ def handle_quit_events():
 def handle_resize_event(event):
     """Handle window resize events for high-DPI displays"""
     global WIDTH, HEIGHT
-    if event.type == pygame.VIDEORESIZE:
+    if event.type == pygame.VIDEORESIZE and (abs(event.w - WIDTH) > RESIZE_MIN_DELTA
+                                             or abs(event.h - HEIGHT) > RESIZE_MIN_DELTA):
         WIDTH, HEIGHT = event.w, event.h
         # Recreate the display with new dimensions
         pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.RESIZABLE)
 
-def main():
-    # Get user input for numbers BEFORE initializing pygame
-    items = get_user_input()
+def main(numbers=None):
+    # Get user input for numbers BEFORE initializing pygame (unless numbers were given)
+    items = numbers or get_user_input()
     
     # Now initialize pygame after tkinter is done
-    global screen, font, clock, WIDTH, HEIGHT
+    global screen, font, clock, WIDTH, HEIGHT, full_redraw
     
     # Initialize pygame
     pygame.init()
@@ -445,6 +583,9 @@ def main():
                 font = pygame.font.SysFont("Consolas", 24)
             except:
                 font = pygame.font.SysFont("monospace", 24)
+    # cached text belongs to the previous font
+    render_cached.cache_clear()
+    text_block.cache_clear()
     
     clock = pygame.time.Clock()
     
@@ -454,15 +595,29 @@ def main():
     ascending = True
     start_time = None
     execution_time = ""
+    next_frame = 0.0  # perf_counter time the next sorting frame is due
+    pending_resize = None  # last VIDEORESIZE, applied once the drag settles
+    resize_time = 0.0
 
     while True:
+        events = pygame.event.get()
+        if not events and current_gen is not None:
+            # sleep until the next sorting frame is due; an event ends the
+            # wait early so key presses are handled straight away
+            wait_ms = int((next_frame - time.perf_counter()) * 1000)
+            if wait_ms > 0:
+                events = [pygame.event.wait(wait_ms)]
+
         # Handle events
-        for ev in pygame.event.get():
+        for ev in events:
             if ev.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             elif ev.type == pygame.VIDEORESIZE:
-                handle_resize_event(ev)
+                pending_resize = ev
+                resize_time = time.perf_counter()
+            elif ev.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                full_redraw = True
             elif ev.type == pygame.KEYDOWN:
                 if ev.key == pygame.K_ESCAPE:
                     pygame.quit()
@@ -507,24 +662,8 @@ def main():
                     if selected_algorithm:
                         start_time = time.time()
                         execution_time = ""
-                        if selected_algorithm == "bubble":
-                            current_gen = bubble_sort_gen(items, ascending=ascending)
-                            current_title = f"Bubble Sort ({'Ascending' if ascending else 'Descending'})"
-                        elif selected_algorithm == "insertion":
-                            current_gen = insertion_sort_gen(items, ascending=ascending)
-                            current_title = f"Insertion Sort ({'Ascending' if ascending else 'Descending'})"
-                        elif selected_algorithm == "selection":
-                            current_gen = selection_sort_gen(items, ascending=ascending)
-                            current_title = f"Selection Sort ({'Ascending' if ascending else 'Descending'})"
-                        elif selected_algorithm == "quick":
-                            current_gen = quick_sort_gen(items, ascending=ascending)
-                            current_title = f"Quick Sort ({'Ascending' if ascending else 'Descending'})"
-                        elif selected_algorithm == "merge":
-                            current_gen = merge_sort_gen(items, ascending=ascending)
-                            current_title = f"Merge Sort ({'Ascending' if ascending else 'Descending'})"
-                        elif selected_algorithm == "heap":
-                            current_gen = heap_sort_gen(items, ascending=ascending)
-                            current_title = f"Heap Sort ({'Ascending' if ascending else 'Descending'})"
+                        current_gen = SORT_GENERATORS[selected_algorithm](items, ascending=ascending)
+                        current_title = f"{selected_algorithm.title()} Sort ({'Ascending' if ascending else 'Descending'})"
                 
                 # Reshuffle
                 elif ev.key == pygame.K_r:
@@ -543,27 +682,36 @@ def main():
                     current_gen = None
                     current_title = f"Instantly sorted ({'Ascending' if ascending else 'Descending'})"
 
+        # recreate the display only once resizing has settled
+        if pending_resize is not None and time.perf_counter() - resize_time >= RESIZE_SETTLE_MS / 1000:
+            handle_resize_event(pending_resize)
+            pending_resize = None
+
         # if generator active, advance step by step
         if current_gen is not None:
+            frame_start = time.perf_counter()
+            if frame_start < next_frame:
+                continue
+            next_frame = frame_start + SLEEP_MS / 1000
             try:
-                arr_state, active = next(current_gen)
-                items = arr_state[:]
+                # advance several steps per frame and draw only the last state;
+                # generators sort their own copy in place, so the state is
+                # shared rather than copied every step
+                for _ in range(STEPS_PER_FRAME):
+                    items, active = next(current_gen)
                 time_complexity = get_time_complexity(selected_algorithm)
                 draw(items, active_indices=active, title=current_title, 
                      time_complexity=time_complexity, execution_time=execution_time)
-                # small wait but keep event loop alive
-                pygame.time.wait(SLEEP_MS)
-                # process events so window remains responsive
-                pygame.event.pump()
             except StopIteration:
                 if start_time:
                     execution_time = f"{(time.time() - start_time):.4f} seconds"
                 current_gen = None
                 current_title = "Sorting Complete!"
         else:
-            time_complexity = get_time_complexity(selected_algorithm) if selected_algorithm else ""
+            time_complexity = get_time_complexity(selected_algorithm)
             draw(items, title=current_title, time_complexity=time_complexity, execution_time=execution_time)
             clock.tick(30)
 
 if __name__ == "__main__":
-    main()
+    # The web app passes its numbers as a JSON file path, or '-' for stdin
+    main(load_numbers(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -12,7 +12,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
 def gen_random_list(n):
-    return [random.randint(5, 100) for _ in range(n)]
+    return random.choices(range(5, 101), k=n)
 
 class NumberInputDialog(QDialog):
     def __init__(self):